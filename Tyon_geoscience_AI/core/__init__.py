@@ -2,3 +2,4 @@ from . import fractal_analysis
 from . import entropy_calc
 from . import rqi_model
 from . import trap_predictor
+from . import threshold_sweep
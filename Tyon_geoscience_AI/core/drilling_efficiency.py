@@ -1,32 +1,182 @@
 # core/drilling_efficiency.py
+import warnings
+
 import numpy as np
+import pandas as pd
+from joblib import parallel_backend
 from sklearn.ensemble import RandomForestRegressor
-from sklearn.model_selection import train_test_split
+from sklearn.model_selection import KFold, cross_val_score, train_test_split
 from sklearn.metrics import r2_score
 
+# Columns produced by drilling_features, in order
+FEATURE_COLUMNS = ['depth', 'porosity', 'permeability', 'entropy', 'fractal_dim']
+
+
+def drilling_features(geo_memory):
+    """Build the formation feature matrix from analyzed geo_memory points
+
+    Gaps are filled with the column median; a column missing for every point
+    (entropy needs 10+ porosity samples, so it often is) is set to 0, which
+    keeps the FEATURE_COLUMNS layout and carries no weight in the forest.
+    """
+    n = len(geo_memory)
+    if n == 0:
+        return np.empty((0, len(FEATURE_COLUMNS)))
+
+    # Porosity samples vary in length per point: mean the non-empty ones in one pass
+    porosity = [np.atleast_1d(np.asarray(r.get('porosity', []), dtype=float)) for r in geo_memory]
+    lengths = np.array([len(p) for p in porosity])
+    starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    filled = lengths > 0
+    mean_porosity = np.full(n, np.nan)
+    if filled.any():
+        sums = np.add.reduceat(np.concatenate(porosity), starts[filled])
+        mean_porosity[filled] = sums / lengths[filled]
+
+    scalar_columns = [key for key in FEATURE_COLUMNS if key != 'porosity']
+    features = pd.DataFrame.from_records(geo_memory, columns=scalar_columns)
+    features = features.apply(pd.to_numeric, errors='coerce')
+    features['porosity'] = mean_porosity
+    features = features[FEATURE_COLUMNS]
+    return features.fillna(features.median()).fillna(0.0).to_numpy(dtype=float)
+
+
+def reservoir_sample(chunks, max_samples, rng):
+    """Uniform sample of at most max_samples rows from a stream of (X, y) chunks
+
+    Returns (X_sample, y_sample, n_seen). Only one chunk and the sample are
+    held in memory at a time.
+    """
+    X_sample = y_sample = None
+    seen = 0
+    for X_chunk, y_chunk in chunks:
+        X_chunk = np.asarray(X_chunk, dtype=float)
+        y_chunk = np.asarray(y_chunk, dtype=float)
+        if X_sample is None:
+            X_sample = np.empty((max_samples, X_chunk.shape[1]))
+            y_sample = np.empty(max_samples)
+
+        # Fill the buffer first
+        n_fill = min(max(max_samples - seen, 0), len(X_chunk))
+        X_sample[seen:seen + n_fill] = X_chunk[:n_fill]
+        y_sample[seen:seen + n_fill] = y_chunk[:n_fill]
+
+        # Then row t replaces a random slot with probability max_samples / (t + 1)
+        positions = np.arange(seen + n_fill, seen + len(X_chunk))
+        slots = rng.integers(0, positions + 1)
+        keep = slots < max_samples
+        rows = n_fill + np.flatnonzero(keep)
+        slots = slots[keep]
+        # Later rows win when two rows land in the same slot
+        slots, last = np.unique(slots[::-1], return_index=True)
+        rows = rows[::-1][last]
+        X_sample[slots] = X_chunk[rows]
+        y_sample[slots] = y_chunk[rows]
+
+        seen += len(X_chunk)
+
+    if seen == 0:
+        raise ValueError("No training chunks provided")
+
+    n = min(seen, max_samples)
+    return X_sample[:n], y_sample[:n], seen
+
+
+def iter_feature_chunks(paths, target='efficiency', chunksize=100000):
+    """Yield (X, y) chunks from one or more feature CSV files without loading them whole
+
+    Features are read by name in FEATURE_COLUMNS order, whatever the column
+    order in the file; other columns are skipped.
+    """
+    if isinstance(paths, str):
+        paths = [paths]
+    columns = FEATURE_COLUMNS + [target]
+    for path in paths:
+        reader = pd.read_csv(
+            path, usecols=columns, dtype={col: float for col in columns}, chunksize=chunksize
+        )
+        for chunk in reader:
+            yield chunk[FEATURE_COLUMNS].to_numpy(), chunk[target].to_numpy()
+
+
 class DrillingEfficiencyPredictor:
     """Predicts drilling efficiency for groundwater wells"""
-    
-    def __init__(self):
-        self.model = RandomForestRegressor(n_estimators=100, random_state=42)
+
+    def __init__(self, n_estimators=100, min_r2=0.6, n_jobs=-1, max_leaf_nodes=None):
+        self.n_estimators = n_estimators
+        self.min_r2 = min_r2
+        self.n_jobs = n_jobs
+        self.max_leaf_nodes = max_leaf_nodes
+        self.model = self._make_model()
         self.trained = False
-        
+        self.r2 = None
+
+    def _make_model(self, n_jobs=None, max_leaf_nodes=None):
+        """Random forest used by every training path"""
+        return RandomForestRegressor(
+            n_estimators=self.n_estimators,
+            max_leaf_nodes=max_leaf_nodes or self.max_leaf_nodes,
+            random_state=42,
+            n_jobs=self.n_jobs if n_jobs is None else n_jobs
+        )
+
+    def _accept(self, r2):
+        """Mark the model trained if validation R² is reasonable, warn otherwise"""
+        self.r2 = r2
+        self.trained = r2 > self.min_r2  # Only mark as trained if reasonable accuracy
+        if not self.trained:
+            warnings.warn(
+                f"Validation R² {r2:.3f} is not above {self.min_r2}; model left untrained"
+            )
+        return r2
+
     def train(self, X, y):
         """Train model on historical drilling data"""
         X_train, X_test, y_train, y_test = train_test_split(
             X, y, test_size=0.2, random_state=42
         )
+        self.model = self._make_model()
         self.model.fit(X_train, y_train)
-        
+
         # Validate model performance
         preds = self.model.predict(X_test)
-        r2 = r2_score(y_test, preds)
-        self.trained = r2 > 0.6  # Only mark as trained if reasonable accuracy
-        
-        return r2
-        
+        return self._accept(r2_score(y_test, preds))
+
+    def cross_validate(self, X, y, n_splits=5):
+        """K-fold R² scores, with the folds fitted in parallel
+
+        Folds run in threads (tree fitting releases the GIL), so X is shared
+        rather than copied into one worker process per fold.
+        """
+        folds = KFold(n_splits=n_splits, shuffle=True, random_state=42)
+        # Folds run in parallel, so each forest stays on one core
+        model = self._make_model(n_jobs=1)
+        with parallel_backend('threading', n_jobs=self.n_jobs):
+            return cross_val_score(model, X, y, cv=folds, scoring='r2')
+
+    def train_sampled(self, chunks, X_val, y_val, max_samples=200000, max_leaf_nodes=1024, seed=42):
+        """Fit on a uniform sample of a stream of (X, y) chunks that may be larger than RAM
+
+        At most max_samples rows are kept (reservoir sampling, so every row of
+        the stream is equally likely to be used); rows beyond that do not
+        contribute. Peak memory is one chunk, plus the sample (max_samples x
+        (features + 1) x 8 bytes, 9.6 MB for the defaults), plus a forest of
+        n_estimators trees capped at max_leaf_nodes leaves each (about 15 MB
+        for the defaults), whatever the size of the stream.
+        """
+        X_sample, y_sample, _ = reservoir_sample(chunks, max_samples, np.random.default_rng(seed))
+        self.model = self._make_model(max_leaf_nodes=max_leaf_nodes)
+        self.model.fit(X_sample, y_sample)
+        return self._accept(r2_score(y_val, self.model.predict(X_val)))
+
     def predict(self, formation_features):
         """Predict drilling efficiency (meters/hour)"""
         if not self.trained:
             raise RuntimeError("Model not trained or training failed")
         return self.model.predict([formation_features])[0]
+
+    def predict_batch(self, X):
+        """Predict drilling efficiency (meters/hour) for many formations at once"""
+        if not self.trained:
+            raise RuntimeError("Model not trained or training failed")
+        return self.model.predict(X)
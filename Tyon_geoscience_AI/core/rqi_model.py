@@ -19,3 +19,32 @@ class ReservoirQualityIndex:
     def geothermal(porosity, permeability, temp_grad):
         """Energy Potential Index (EPI)"""
         return (permeability * porosity * temp_grad) / 1e6
+
+# Gradients used when pressure/temperature are not measured
+HYDROSTATIC_GRADIENT = 0.0098  # MPa per meter (fresh water)
+GEOTHERMAL_GRADIENT = 0.025    # °C per meter
+SURFACE_TEMPERATURE = 15.0     # °C
+
+def calculate_pressure(depth):
+    """Hydrostatic pore pressure (MPa) at depth (m)"""
+    return HYDROSTATIC_GRADIENT * depth
+
+def calculate_temperature(depth):
+    """Formation temperature (°C) from a normal geothermal gradient"""
+    return SURFACE_TEMPERATURE + GEOTHERMAL_GRADIENT * depth
+
+def compute_rqi(porosity, permeability):
+    """RQI (μm) from porosity in percent and permeability in mD"""
+    return ReservoirQualityIndex.hydrocarbon(porosity / 100.0, permeability)
+
+def hydraulic_conductivity(permeability):
+    """Hydraulic conductivity of fresh water (m/day) from permeability in mD"""
+    # K = k * rho * g / mu with rho=1000 kg/m³, mu=1e-3 Pa·s
+    return permeability * 9.869233e-16 * 1000 * 9.81 / 1e-3 * 86400
+
+def temperature_anomaly_ratio(temperature, depth):
+    """Formation temperature over the normal-gradient temperature at depth
+
+    Values above 1 flag zones hotter than the regional gradient predicts.
+    """
+    return temperature / calculate_temperature(depth)
@@ -0,0 +1,83 @@
+# core/threshold_sweep.py
+import numpy as np
+import pandas as pd
+
+from .trap_predictor import ZoneDetector
+
+# Contamination levels tried when none are given
+DEFAULT_CONTAMINATIONS = (0.05, 0.1, 0.15, 0.2)
+
+
+def depth_intervals(depths, selected):
+    """Merge selected points that are neighbours in depth order into (top, base) intervals"""
+    order = np.argsort(depths)
+    depths = np.asarray(depths, dtype=float)[order]
+    selected = np.asarray(selected, dtype=bool)[order]
+    if not selected.any():
+        return []
+
+    # Run boundaries of consecutive selected points
+    edges = np.diff(np.concatenate([[0], selected.astype(np.int8), [0]]))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1) - 1
+    return [(float(depths[s]), float(depths[e])) for s, e in zip(starts, ends)]
+
+
+class ThresholdSweep:
+    """Evaluates a grid of quality thresholds and contamination levels on one analyzed dataset
+
+    Features and IsolationForest scores are computed once in the constructor;
+    every configuration after that is only a percentile cut and a comparison.
+    """
+
+    def __init__(self, geo_memory, application='hydrocarbon', detector=None, n_jobs=None):
+        self.application = application
+        self.detector = detector if detector is not None else ZoneDetector(application=application)
+        self.depths = np.array([r['depth'] for r in geo_memory], dtype=float)
+
+        X, self.quality_scores = self.detector.build_features(geo_memory)
+        self.scores = self.detector.anomaly_scores(X, n_jobs=n_jobs)
+
+    def evaluate(self, thresholds=None, contaminations=DEFAULT_CONTAMINATIONS):
+        """Zone counts and depth intervals for every (threshold, contamination) pair"""
+        if thresholds is None:
+            thresholds = [self.detector.quality_threshold]
+        thresholds = np.asarray(thresholds, dtype=float)
+
+        # One row of the grid per threshold, evaluated in a single comparison
+        above = self.quality_scores[None, :] > thresholds[:, None]
+
+        rows = []
+        for contamination in contaminations:
+            anomalies = self.detector.anomaly_mask(self.scores, contamination)
+            selected = above & anomalies[None, :]
+            for threshold, mask in zip(thresholds, selected):
+                intervals = depth_intervals(self.depths, mask)
+                rows.append({
+                    'application': self.application,
+                    'threshold': float(threshold),
+                    'contamination': float(contamination),
+                    'n_zones': int(mask.sum()),
+                    'n_intervals': len(intervals),
+                    'top_depth': intervals[0][0] if intervals else np.nan,
+                    'base_depth': intervals[-1][1] if intervals else np.nan,
+                    'intervals': intervals,
+                })
+
+        return pd.DataFrame(rows)
+
+
+def sweep_thresholds(geo_memory, application, thresholds=None,
+                     contaminations=DEFAULT_CONTAMINATIONS, detector=None, n_jobs=None):
+    """Run a threshold/contamination sweep over analyzed points
+
+    Without a threshold grid, the detector's quality_threshold is used; pass
+    a ZoneDetector built with your thresholds to override its defaults.
+    """
+    if len(geo_memory) < 10:
+        return pd.DataFrame(columns=[
+            'application', 'threshold', 'contamination', 'n_zones',
+            'n_intervals', 'top_depth', 'base_depth', 'intervals'
+        ])
+    sweep = ThresholdSweep(geo_memory, application=application, detector=detector, n_jobs=n_jobs)
+    return sweep.evaluate(thresholds=thresholds, contaminations=contaminations)
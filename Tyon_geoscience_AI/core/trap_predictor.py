@@ -2,6 +2,14 @@ import numpy as np
 from sklearn.ensemble import IsolationForest
 from sklearn.preprocessing import StandardScaler
 
+# Quality metric used for each application
+QUALITY_KEYS = {
+    'hydrocarbon': 'rqi',
+    'groundwater': 'hydraulic_conductivity',
+    'contamination': 'contaminant_risk',
+    'geothermal': 'temperature',
+}
+
 class ZoneDetector:
     """Identifies optimal zones using anomaly detection with application-specific thresholds"""
     
@@ -19,49 +27,64 @@ class ZoneDetector:
             
         self.contamination = 0.1  # For IsolationForest
         
+    def quality_key(self):
+        """Name of the geo_memory field used as the quality metric"""
+        return QUALITY_KEYS.get(self.application)
+
+    def build_features(self, geo_memory):
+        """Standardized feature matrix and quality scores for each analyzed point"""
+        # Feature engineering - use application-specific quality metrics
+        key = self.quality_key()
+        quality_scores = np.array([r.get(key, 0) if key else 0 for r in geo_memory], dtype=float)
+        features = np.column_stack([
+            np.array([r['entropy'] for r in geo_memory], dtype=float),
+            quality_scores,
+            np.array([r['fractal_dim'] for r in geo_memory], dtype=float),
+        ])
+
+        # Drop features that are missing everywhere (e.g. entropy of short
+        # porosity samples) and fill the remaining gaps with the feature mean
+        features = features[:, ~np.isnan(features).all(axis=0)]
+        if features.shape[1] == 0:
+            raise ValueError("No usable features: entropy, quality and fractal_dim are all missing")
+        gaps = np.isnan(features)
+        if gaps.any():
+            features[gaps] = np.take(np.nanmean(features, axis=0), np.nonzero(gaps)[1])
+
+        # Standardization
+        X = StandardScaler().fit_transform(features)
+        return X, np.nan_to_num(quality_scores)
+
+    def anomaly_scores(self, X, n_jobs=None):
+        """IsolationForest scores (lower = more anomalous)
+
+        The scores do not depend on the contamination level, so they can be
+        reused with ``anomaly_mask`` for any number of contamination values.
+        """
+        clf = IsolationForest(random_state=42, n_jobs=n_jobs)
+        clf.fit(X)
+        return clf.score_samples(X)
+
+    @staticmethod
+    def anomaly_mask(scores, contamination):
+        """Flag the most anomalous fraction of points, as IsolationForest.fit_predict does"""
+        offset = np.percentile(scores, 100.0 * contamination)
+        return scores < offset
+
     def detect(self, geo_memory):
         """Find target zones from analysis results"""
         if len(geo_memory) < 10:
             return []
-            
-        # Feature engineering - use application-specific quality metrics
-        features = []
-        quality_scores = []
-        
-        for r in geo_memory:
-            if self.application == 'hydrocarbon':
-                quality = r.get('rqi', 0)
-            elif self.application == 'groundwater':
-                quality = r.get('hydraulic_conductivity', 0)
-            elif self.application == 'contamination':
-                quality = r.get('contaminant_risk', 0)
-            elif self.application == 'geothermal':
-                quality = r.get('temperature', 0)
-            else:
-                quality = 0
-                
-            features.append([r['entropy'], quality, r['fractal_dim']])
-            quality_scores.append(quality)
-        
-        # Convert to arrays
-        features = np.array(features)
-        quality_scores = np.array(quality_scores)
-        
-        # Standardization
-        scaler = StandardScaler()
-        X = scaler.fit_transform(features)
-        
+
+        X, quality_scores = self.build_features(geo_memory)
+
         # Anomaly detection
-        clf = IsolationForest(
-            contamination=self.contamination, 
-            random_state=42
-        )
-        anomalies = clf.fit_predict(X)
-        
+        anomalies = self.anomaly_mask(self.anomaly_scores(X), self.contamination)
+
         # Return points that meet quality threshold AND are anomalies
         return [
             r for i, r in enumerate(geo_memory)
-            if (quality_scores[i] > self.quality_threshold) and (anomalies[i] == -1)
+            if (quality_scores[i] > self.quality_threshold) and anomalies[i]
         ]
 
 # Unified prediction function
@@ -0,0 +1,132 @@
+import os
+import sys
+
+# Add this at the top of your script - BEFORE other imports
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.insert(0, parent_dir)
+
+import multiprocessing
+import pickle
+import resource
+import tempfile
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import r2_score
+from core.drilling_efficiency import (
+    FEATURE_COLUMNS, DrillingEfficiencyPredictor, drilling_features, iter_feature_chunks
+)
+from execution.run_analysis import GeoscienceAnalysisSystem
+
+def synthetic_drilling_data(n_samples, seed=42):
+    """Formation features from analyzed simulated wells, with a simulated efficiency (meters/hour)"""
+    rng = np.random.default_rng(seed)
+    dataset = [
+        {
+            'depth': depth,
+            'base_porosity': base_poro,
+            'permeability': perm,
+            'lithology': lithology,
+        }
+        for depth, base_poro, perm, lithology in zip(
+            rng.uniform(100, 3000, n_samples),
+            rng.uniform(5, 30, n_samples),
+            rng.lognormal(5, 1.5, n_samples),
+            rng.choice(['sandstone', 'carbonate', 'shale'], n_samples),
+        )
+    ]
+    geo_memory = GeoscienceAnalysisSystem('groundwater').analyze_points(dataset, n_jobs=-1, seed=seed)
+    X = drilling_features(geo_memory)
+
+    depth, porosity, permeability = X[:, 0], X[:, 1], X[:, 2]
+    y = (30 * np.exp(-depth / 2000) + 0.3 * porosity + np.log1p(permeability)
+         + rng.normal(0, 1, n_samples))
+    return X, y
+
+def peak_rss_mb():
+    """Peak resident memory of this process in MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes on Linux
+    return peak / 1e6 if sys.platform == 'darwin' else peak / 1e3
+
+def measure(method, data, X_val, y_val, n_jobs, n_splits, chunksize):
+    """Run one training method and report its time, peak RSS, model size and R²"""
+    predictor = DrillingEfficiencyPredictor(n_jobs=n_jobs)
+    baseline = peak_rss_mb()
+    holdout_r2 = cv_r2 = np.nan
+
+    start = time.perf_counter()
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        if method == 'train':
+            predictor.train(*data)
+        elif method == 'cross_validate':
+            cv_r2 = float(np.mean(predictor.cross_validate(*data, n_splits=n_splits)))
+        else:
+            chunks = iter_feature_chunks(data, chunksize=chunksize)
+            holdout_r2 = predictor.train_sampled(chunks, X_val, y_val)
+    seconds = time.perf_counter() - start
+
+    if method == 'train':
+        holdout_r2 = r2_score(y_val, predictor.model.predict(X_val))
+
+    return {
+        'seconds': seconds,
+        'peak_rss_mb': peak_rss_mb(),
+        'fit_rss_mb': peak_rss_mb() - baseline,
+        'model_mb': 0.0 if method == 'cross_validate' else len(pickle.dumps(predictor.model)) / 1e6,
+        'holdout_r2': holdout_r2,
+        'cv_r2': cv_r2,
+    }
+
+def benchmark_training(X, y, sizes, n_splits=5, n_jobs=-1, chunksize=10000):
+    """Report training time and memory against dataset size
+
+    Rows after max(sizes) are held out, and every fitted model is scored on
+    that same holdout. Each measurement runs in a fresh process, so peak RSS
+    covers memory that sklearn allocates in C (tree arrays) as well as the
+    Python heap. train_sampled streams its rows from a CSV file and never
+    holds the full array.
+    """
+    X_val, y_val = X[max(sizes):], y[max(sizes):]
+    if len(X_val) == 0:
+        raise ValueError("X needs rows beyond max(sizes) to hold out for validation")
+
+    context = multiprocessing.get_context('spawn')
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            X_n, y_n = X[:size], y[:size]
+            path = os.path.join(tmp, f'features_{size}.csv')
+            frame = pd.DataFrame(X_n, columns=FEATURE_COLUMNS)
+            frame['efficiency'] = y_n
+            frame.to_csv(path, index=False)
+
+            runs = [
+                ('train', (X_n, y_n)),
+                ('cross_validate', (X_n, y_n)),
+                ('train_sampled', path),
+            ]
+            for method, data in runs:
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                    result = pool.submit(
+                        measure, method, data, X_val, y_val, n_jobs, n_splits, chunksize
+                    ).result()
+                rows.append({
+                    'method': method,
+                    'n_samples': len(X_n),
+                    'data_mb': X_n.nbytes / 1e6,
+                    **result,
+                })
+
+    return pd.DataFrame(rows)
+
+if __name__ == "__main__":
+    sizes = [1000, 5000, 20000]
+    X, y = synthetic_drilling_data(max(sizes) + 5000)
+    print(f"Features: {', '.join(FEATURE_COLUMNS)}")
+    print(benchmark_training(X, y, sizes).to_string(index=False))
@@ -7,10 +7,90 @@ parent_dir = os.path.abspath(os.path.join(current_dir, '..'))
 sys.path.insert(0, parent_dir)
 
 import numpy as np
+from joblib import Parallel, delayed, effective_n_jobs
 from core.fractal_analysis import compute_fractal_dimension
-from core.entropy_calc import shannon_entropy, rqi_model, trap_predictor
+from core.entropy_calc import shannon_entropy
+from core import rqi_model, trap_predictor
+from core.threshold_sweep import sweep_thresholds, DEFAULT_CONTAMINATIONS
 from utils import data_loader, data_simulator, unit_converter
 
+# Below this many points, starting worker processes costs more than it saves
+PARALLEL_MIN_POINTS = 5000
+
+def _analyze_point(data_point, application, rng=None):
+    """Analyze a single data point (rng: optional numpy Generator for simulated values)"""
+    depth = data_point['depth']
+    lithology = data_point.get('lithology', 'sandstone')
+    
+    # Generate or use provided porosity data
+    if 'porosity' in data_point:
+        porosity = data_point['porosity']
+        if not isinstance(porosity, list):
+            porosity = [porosity]  # Ensure array format
+    else:
+        # If base_porosity is not provided, use a default based on lithology
+        base_poro = data_point.get('base_porosity', 20)  # Default to 20%
+        porosity = data_simulator.simulate_porosity(
+            depth, 
+            base_poro, 
+            lithology,
+            rng=rng
+        )
+    
+    # Get permeability
+    permeability = data_point.get('permeability', 100)
+    
+    # Core calculations
+    fractal_dim = compute_fractal_dimension(porosity)
+    geo_entropy = shannon_entropy(porosity)
+    
+    # Calculate pressure if not provided
+    pressure = data_point.get('pressure')
+    if pressure is None:
+        pressure = rqi_model.calculate_pressure(depth)
+    
+    # Application-specific metrics
+    result = {
+        'depth': depth,
+        'lithology': lithology,
+        'porosity': porosity,
+        'permeability': permeability,
+        'fractal_dim': fractal_dim,
+        'entropy': geo_entropy,
+        'pressure': pressure,
+    }
+    
+    # Add application-specific properties
+    if application == 'hydrocarbon' or application == 'groundwater':
+        rqi = rqi_model.compute_rqi(np.mean(porosity), permeability)
+        result['rqi'] = rqi
+        
+        if application == 'groundwater':
+            hc = rqi_model.hydraulic_conductivity(permeability)
+            result['hydraulic_conductivity'] = hc
+            
+    elif application == 'contamination':
+        # Generate environmental data if not provided
+        if 'contaminant_risk' not in data_point:
+            env_data = data_simulator.generate_environmental_data(depth, lithology, rng=rng)
+            result['contaminant_risk'] = env_data['contaminant_risk']
+        else:
+            result['contaminant_risk'] = data_point['contaminant_risk']
+            
+    elif application == 'geothermal':
+        temperature = data_point.get('temperature', rqi_model.calculate_temperature(depth))
+        result['temperature'] = temperature
+        result['temperature_anomaly'] = rqi_model.temperature_anomaly_ratio(temperature, depth)
+    
+    return result
+
+def _analyze_chunk(points, application, seeds):
+    """Analyze a batch of points, one Generator per point"""
+    return [
+        _analyze_point(data_point, application, np.random.default_rng(seed))
+        for data_point, seed in zip(points, seeds)
+    ]
+
 class GeoscienceAnalysisSystem:
     """Integrated analysis system for geological applications"""
     
@@ -22,91 +102,78 @@ class GeoscienceAnalysisSystem:
         self.leak_threshold = None
         self.temp_threshold = None
     
-    def analyze_point(self, data_point):
-        """Analyze a single data point"""
-        depth = data_point['depth']
-        lithology = data_point.get('lithology', 'sandstone')
-        
-        # Generate or use provided porosity data
-        if 'porosity' in data_point:
-            porosity = data_point['porosity']
-            if not isinstance(porosity, list):
-                porosity = [porosity]  # Ensure array format
-        else:
-            # If base_porosity is not provided, use a default based on lithology
-            base_poro = data_point.get('base_porosity', 20)  # Default to 20%
-            porosity = data_simulator.simulate_porosity(
-                depth, 
-                base_poro, 
-                lithology
-            )
-        
-        # Get permeability
-        permeability = data_point.get('permeability', 100)
-        
-        # Core calculations
-        fractal_dim = compute_fractal_dimension(porosity)
-        geo_entropy = shannon_entropy(porosity)
-        
-        # Calculate pressure and temperature if not provided
-        if 'pressure' not in data_point:
-            data_point['pressure'] = rqi_model.calculate_pressure(depth)
-        if 'temperature' not in data_point and self.application == 'geothermal':
-            data_point['temperature'] = rqi_model.calculate_temperature(depth)
-        
-        # Application-specific metrics
-        result = {
-            'depth': depth,
-            'lithology': lithology,
-            'porosity': porosity,
-            'permeability': permeability,
-            'fractal_dim': fractal_dim,
-            'entropy': geo_entropy,
-            'pressure': data_point['pressure'],
-        }
-        
-        # Add application-specific properties
-        if self.application == 'hydrocarbon' or self.application == 'groundwater':
-            rqi = rqi_model.compute_rqi(np.mean(porosity), permeability)
-            result['rqi'] = rqi
-            
-            if self.application == 'groundwater':
-                hc = rqi_model.hydraulic_conductivity(permeability)
-                result['hydraulic_conductivity'] = hc
-                
-        elif self.application == 'contamination':
-            # Generate environmental data if not provided
-            if 'contaminant_risk' not in data_point:
-                env_data = data_simulator.generate_environmental_data(depth, lithology)
-                result['contaminant_risk'] = env_data['contaminant_risk']
-            else:
-                result['contaminant_risk'] = data_point['contaminant_risk']
-                
-        elif self.application == 'geothermal':
-            temperature = data_point.get('temperature', rqi_model.calculate_temperature(depth))
-            hc_ratio = rqi_model.heat_capacity_ratio(temperature, data_point['pressure'])
-            result['temperature'] = temperature
-            result['heat_capacity_ratio'] = hc_ratio
-        
-        return result
+    def analyze_point(self, data_point, rng=None):
+        """Analyze a single data point (rng: optional numpy Generator for simulated values)"""
+        return _analyze_point(data_point, self.application, rng)
     
-    def analyze_dataset(self, dataset):
+    def thresholds(self):
+        """Zone thresholds that have been set on the system"""
+        thresholds = {
+            'trap_threshold': self.trap_threshold,
+            'leak_threshold': self.leak_threshold,
+            'temp_threshold': self.temp_threshold,
+        }
+        return {name: value for name, value in thresholds.items() if value is not None}
+
+    def analyze_points(self, dataset, n_jobs=None, seed=None):
+        """Analyze every data point, spreading large batches over n_jobs processes
+
+        Each point gets its own Generator spawned from seed, so serial and
+        parallel runs give the same results. Without a seed, the base seed is
+        drawn from the global np.random state (so np.random.seed still works).
+        Points are sent to workers in one chunk per process; batches smaller
+        than PARALLEL_MIN_POINTS always run serially.
+        """
+        dataset = list(dataset)
+        if seed is None:
+            seed = np.random.randint(2**31 - 1)
+        seeds = np.random.SeedSequence(seed).spawn(len(dataset))
+
+        n_workers = effective_n_jobs(n_jobs) if n_jobs is not None else 1
+        if n_workers == 1 or len(dataset) < PARALLEL_MIN_POINTS:
+            return _analyze_chunk(dataset, self.application, seeds)
+
+        bounds = np.linspace(0, len(dataset), n_workers + 1).astype(int)
+        chunks = Parallel(n_jobs=n_workers)(
+            delayed(_analyze_chunk)(dataset[lo:hi], self.application, seeds[lo:hi])
+            for lo, hi in zip(bounds[:-1], bounds[1:])
+        )
+        return [result for chunk in chunks for result in chunk]
+
+    def analyze_dataset(self, dataset, n_jobs=None, seed=None):
         """Analyze a full dataset"""
-        self.geo_memory = []
-        for data_point in dataset:
-            analyzed_point = self.analyze_point(data_point)
-            self.geo_memory.append(analyzed_point)
+        self.geo_memory = self.analyze_points(dataset, n_jobs=n_jobs, seed=seed)
         
         # Now run trap prediction on the entire analyzed dataset
         predictions = trap_predictor.predict_traps(
             self.geo_memory, 
             application=self.application,
-            trap_threshold=self.trap_threshold,
-            leak_threshold=self.leak_threshold,
-            temp_threshold=self.temp_threshold
+            **self.thresholds()
         )
         
         return {
             "data_points": self.geo_memory,
             "predictions": predictions
         }
+
+    def sweep_thresholds(self, dataset=None, thresholds=None,
+                         contaminations=DEFAULT_CONTAMINATIONS, n_jobs=None, seed=None):
+        """Evaluate a grid of zone thresholds and contamination levels
+
+        Point features are computed once (reusing geo_memory when no dataset
+        is given) and the IsolationForest is fitted once for the whole grid.
+        Without a threshold grid, the system's own threshold is used.
+        Returns a DataFrame with one row per configuration.
+        """
+        if dataset is not None:
+            self.geo_memory = self.analyze_points(dataset, n_jobs=n_jobs, seed=seed)
+
+        detector = trap_predictor.ZoneDetector(application=self.application, **self.thresholds())
+        return sweep_thresholds(
+            self.geo_memory,
+            application=self.application,
+            detector=detector,
+            thresholds=thresholds,
+            contaminations=contaminations,
+            n_jobs=n_jobs
+        )
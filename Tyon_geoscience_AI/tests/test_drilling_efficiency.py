@@ -0,0 +1,74 @@
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.abspath(os.path.join(current_dir, '..')))
+
+import numpy as np
+import pandas as pd
+
+from core.drilling_efficiency import (
+    FEATURE_COLUMNS, drilling_features, iter_feature_chunks, reservoir_sample
+)
+
+def tagged_chunks(n_rows, chunksize):
+    """Chunks whose single feature is the row's position in the stream"""
+    tags = np.arange(n_rows, dtype=float)
+    return ((tags[i:i + chunksize, None], tags[i:i + chunksize]) for i in range(0, n_rows, chunksize))
+
+class FixedSlots:
+    """Stands in for a Generator, returning preset slots from integers()"""
+
+    def __init__(self, slots):
+        self.slots = np.asarray(slots)
+
+    def integers(self, low, high):
+        return self.slots[:len(high)]
+
+def test_reservoir_sample_is_uniform():
+    n_rows, max_samples = 100000, 10000
+    X, y, seen = reservoir_sample(tagged_chunks(n_rows, 7000), max_samples, np.random.default_rng(0))
+
+    assert seen == n_rows
+    assert len(np.unique(X[:, 0])) == max_samples
+    np.testing.assert_array_equal(X[:, 0], y)
+    counts, _ = np.histogram(X[:, 0], bins=10, range=(0, n_rows))
+    # Expected 1000 per bin; 4 standard deviations is about 120
+    assert np.all(np.abs(counts - max_samples / 10) < 120)
+
+def test_reservoir_sample_later_row_wins_slot():
+    # Rows 0-1 fill the buffer; rows 2 and 3 both land in slot 0, row 4 in slot 1
+    X, _, _ = reservoir_sample(tagged_chunks(5, 5), 2, FixedSlots([0, 0, 1]))
+
+    np.testing.assert_array_equal(X[:, 0], [3, 4])
+
+def test_reservoir_sample_short_stream_keeps_everything():
+    X, _, seen = reservoir_sample(tagged_chunks(50, 20), 100, np.random.default_rng(0))
+
+    assert seen == 50
+    np.testing.assert_array_equal(X[:, 0], np.arange(50))
+
+def test_drilling_features_fills_gaps():
+    geo_memory = [
+        {'depth': 100.0, 'porosity': [], 'permeability': 5, 'entropy': np.nan, 'fractal_dim': 0.2},
+        {'depth': 200.0, 'porosity': [1, 3], 'permeability': 7, 'entropy': np.nan, 'fractal_dim': np.nan},
+        {'depth': 300.0, 'porosity': [4.0], 'permeability': 9, 'entropy': np.nan, 'fractal_dim': 0.4},
+    ]
+
+    X = drilling_features(geo_memory)
+
+    assert X.shape == (3, len(FEATURE_COLUMNS))
+    np.testing.assert_allclose(X[:, FEATURE_COLUMNS.index('porosity')], [3.0, 2.0, 4.0])
+    np.testing.assert_allclose(X[:, FEATURE_COLUMNS.index('entropy')], 0.0)
+    np.testing.assert_allclose(X[:, FEATURE_COLUMNS.index('fractal_dim')], [0.2, 0.3, 0.4])
+
+def test_iter_feature_chunks_reads_columns_by_name(tmp_path):
+    path = tmp_path / 'features.csv'
+    row = {'fractal_dim': 0.74, 'lithology': 'sandstone', 'efficiency': 3.0,
+           'entropy': 2.0, 'permeability': 100.0, 'porosity': 9.2, 'depth': 2344.0}
+    pd.DataFrame([row]).to_csv(path, index=False)
+
+    X, y = next(iter_feature_chunks(str(path)))
+
+    np.testing.assert_allclose(X[0], [row[col] for col in FEATURE_COLUMNS])
+    np.testing.assert_allclose(y, [3.0])
@@ -0,0 +1,48 @@
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.abspath(os.path.join(current_dir, '..')))
+
+import numpy as np
+import pytest
+from sklearn.ensemble import IsolationForest
+
+from core.trap_predictor import ZoneDetector
+from core.threshold_sweep import sweep_thresholds
+
+def make_geo_memory(n=200, seed=0):
+    rng = np.random.default_rng(seed)
+    return [
+        {'depth': float(d), 'entropy': rng.normal(), 'fractal_dim': rng.normal(), 'rqi': rng.random()}
+        for d in range(n)
+    ]
+
+@pytest.mark.parametrize('contamination', [0.05, 0.1, 0.2])
+def test_anomaly_mask_matches_fit_predict(contamination):
+    detector = ZoneDetector('hydrocarbon')
+    X, _ = detector.build_features(make_geo_memory())
+
+    expected = IsolationForest(contamination=contamination, random_state=42).fit_predict(X) == -1
+    mask = detector.anomaly_mask(detector.anomaly_scores(X), contamination)
+
+    np.testing.assert_array_equal(mask, expected)
+
+def test_build_features_drops_missing_columns():
+    geo_memory = make_geo_memory()
+    for r in geo_memory:
+        r['entropy'] = np.nan
+
+    X, _ = ZoneDetector('hydrocarbon').build_features(geo_memory)
+
+    assert X.shape == (len(geo_memory), 2)
+    assert not np.isnan(X).any()
+
+def test_sweep_matches_detect():
+    geo_memory = make_geo_memory()
+    detector = ZoneDetector('hydrocarbon', trap_threshold=0.5)
+
+    table = sweep_thresholds(geo_memory, 'hydrocarbon', contaminations=[0.1], detector=detector)
+
+    assert table['threshold'].tolist() == [0.5]
+    assert table['n_zones'].tolist() == [len(detector.detect(geo_memory))]
@@ -1,9 +1,12 @@
 import numpy as np
 
-def simulate_porosity(depth, base_poro, lithology='sandstone', count=5, variability=5):
+def simulate_porosity(depth, base_poro, lithology='sandstone', count=5, variability=5, rng=None):
     """
     Generate realistic porosity array based on geology
+    (rng: optional numpy Generator, defaults to the global np.random state)
     """
+    rng = np.random if rng is None else rng
+
     # Depth compaction effect
     compaction_factor = np.exp(-0.0001 * depth)
     
@@ -22,33 +25,36 @@ def simulate_porosity(depth, base_poro, lithology='sandstone', count=5, variabil
     # Generate samples with realistic distribution
     if lithology in ['shale', 'granite']:
         # Low porosity, lognormal distribution
-        samples = np.random.lognormal(mean=np.log(base_poro), sigma=0.3, size=count)
+        samples = rng.lognormal(mean=np.log(base_poro), sigma=0.3, size=count)
     else:
         # Normal distribution for porous rocks
-        samples = base_poro + np.random.normal(0, variability/3, size=count)
+        samples = base_poro + rng.normal(0, variability/3, size=count)
     
     return np.clip(samples, 0, 40)
 
-def generate_environmental_data(depth, lithology):
+def generate_environmental_data(depth, lithology, rng=None):
     """
     Generate parameters for environmental applications
+    (rng: optional numpy Generator, defaults to the global np.random state)
     """
+    rng = np.random if rng is None else rng
+
     # Base parameters
     if lithology == 'sandstone':
-        base_poro = np.random.uniform(20, 30)
-        perm = np.random.uniform(100, 2000)
-        contaminant_factor = np.random.uniform(0.1, 0.5)
+        base_poro = rng.uniform(20, 30)
+        perm = rng.uniform(100, 2000)
+        contaminant_factor = rng.uniform(0.1, 0.5)
     elif lithology == 'shale':
-        base_poro = np.random.uniform(2, 8)
-        perm = np.random.uniform(0.01, 1)
-        contaminant_factor = np.random.uniform(0.8, 1.2)
+        base_poro = rng.uniform(2, 8)
+        perm = rng.uniform(0.01, 1)
+        contaminant_factor = rng.uniform(0.8, 1.2)
     else:
-        base_poro = np.random.uniform(10, 20)
-        perm = np.random.uniform(10, 100)
-        contaminant_factor = np.random.uniform(0.3, 0.7)
+        base_poro = rng.uniform(10, 20)
+        perm = rng.uniform(10, 100)
+        contaminant_factor = rng.uniform(0.3, 0.7)
     
     return {
-        'porosity': simulate_porosity(depth, base_poro, lithology),
+        'porosity': simulate_porosity(depth, base_poro, lithology, rng=rng),
         'permeability': perm,
         'contaminant_risk': contaminant_factor * depth / 1000
   }
@@ -62,17 +62,17 @@ def generate_full_report(geo_memory, application='hydrocarbon'):
         conductivities = [d.get('hydraulic_conductivity', 0) for d in geo_memory]
         ax3.scatter(depths, conductivities, c=entropies, cmap='plasma', s=50)
         ax3.set_title('Hydraulic Conductivity vs Depth')
-        ax3.set_ylabel('K (m/s)')
+        ax3.set_ylabel('K (m/day)')
         plt.colorbar(sc3, ax=ax3, label='Entropy')
     
     elif application in ['contamination', 'geothermal']:
-        risks = [d.get('contaminant_risk', d.get('heat_capacity_ratio', 0)) 
+        risks = [d.get('contaminant_risk', d.get('temperature_anomaly', 0)) 
                 for d in geo_memory]
         ax3.scatter(depths, risks, c=entropies, cmap='plasma', s=50)
         ax3.set_title('Risk Profile' if application == 'contamination' 
-                     else 'Heat Capacity Ratio')
+                     else 'Temperature Anomaly')
         ax3.set_ylabel('Risk Score' if application == 'contamination' 
-                      else 'Cp/Cv Ratio')
+                      else 'T / Normal-Gradient T')
         plt.colorbar(sc3, ax=ax3, label='Entropy')
     
     # Plot 4: 3D-like projection